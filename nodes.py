@@ -9,9 +9,17 @@ Nodes:
 - AlexandriaLoad: Triggers template load when workflow executes
 """
 
+import asyncio
+import functools
 import json
 import hashlib
 import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 
@@ -24,44 +32,129 @@ except ImportError:
     SERVER_AVAILABLE = False
     print("Alexandria: PromptServer not available - nodes will have limited functionality")
 
+# Use orjson for template payloads when installed, falling back to the stdlib
+try:
+    import orjson
+
+    def _json_dumps(obj, indent=False, sort_keys=False):
+        """Serialize obj to UTF-8 JSON bytes."""
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj, indent=False, sort_keys=False):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(
+            obj, indent=2 if indent else None, sort_keys=sort_keys, ensure_ascii=False
+        ).encode('utf-8')
+
+    _json_loads = json.loads
+
 # Default storage directory (relative to ComfyUI root)
 DEFAULT_STORAGE_DIR = "alexandria_templates"
 
 # Global storage directory (can be updated by Control node)
 _current_storage_dir = None
 
+# Resolved absolute storage path, keyed by the storage directory it was built from
+_storage_path_cache = (None, Path())
+
 # Store for tracking template state (used for diff detection)
 # Note: This is server-side only, templates are stored in browser localStorage
 # Limited to MAX_TEMPLATE_STATE_ENTRIES to prevent memory leak over long sessions
-_template_state = {}
+# Kept in LRU order: most recently used template at the end
+_template_state = OrderedDict()
 MAX_TEMPLATE_STATE_ENTRIES = 200
 
+# Content type for /alexandria/save bodies that are already canonical JSON
+# (stable key order and formatting), letting the server hash the raw bytes
+CANONICAL_CONTENT_TYPE = "application/vnd.alexandria.canonical+json"
+
+# Debounce for /alexandria/save: changes arriving within this window of the last
+# write are coalesced so only the latest payload is written when the window ends
+_SAVE_DEBOUNCE_SEC = 0.5
+_last_save_ts = {}
+_pending_saves = {}
+_flush_tasks = set()
+
+
+# Cached (epoch second, ISO string) so bursts of saves format the timestamp once
+_ts_cache = (0, "")
+
+
+def _iso_now():
+    """Current local time as a second-resolution ISO 8601 string."""
+    global _ts_cache
+    sec = int(time.time())
+    cached_sec, cached_iso = _ts_cache
+    if cached_sec == sec:
+        return cached_iso
+    iso = datetime.fromtimestamp(sec).isoformat()
+    _ts_cache = (sec, iso)
+    return iso
+
 
 def _evict_oldest_template_state():
-    """Evict oldest entries if over limit to prevent memory leak."""
-    global _template_state
-    if len(_template_state) > MAX_TEMPLATE_STATE_ENTRIES:
-        # Remove oldest 20% when over limit
-        to_remove = len(_template_state) - int(MAX_TEMPLATE_STATE_ENTRIES * 0.8)
-        keys_to_remove = list(_template_state.keys())[:to_remove]
-        for key in keys_to_remove:
-            del _template_state[key]
-        print(f"Alexandria: Evicted {to_remove} old template state entries")
+    """Evict least recently used entries if over limit to prevent memory leak."""
+    while len(_template_state) > MAX_TEMPLATE_STATE_ENTRIES:
+        template_name, _ = _template_state.popitem(last=False)
+        _last_save_ts.pop(template_name, None)
+
+
+# Frontend messages are buffered briefly and sent as one "alexandria.batch" frame,
+# so a workflow with many Save nodes doesn't emit one WebSocket frame per node
+FRONTEND_BATCH_DELAY_SEC = 0.02
+_pending_frontend_msgs = []
+_frontend_flush_scheduled = False
+_frontend_msgs_lock = threading.Lock()
+
+
+def _flush_frontend():
+    """Send all buffered frontend messages as a single batch frame."""
+    global _pending_frontend_msgs, _frontend_flush_scheduled
+    with _frontend_msgs_lock:
+        msgs = _pending_frontend_msgs
+        _pending_frontend_msgs = []
+        _frontend_flush_scheduled = False
+
+    if not msgs:
+        return
+    try:
+        PromptServer.instance.send_sync("alexandria.batch", {"msgs": msgs})
+    except Exception as e:
+        print(f"Alexandria: Failed to send batch of {len(msgs)} messages: {e}")
 
 
 def _send_to_frontend(event_type: str, data: dict) -> bool:
     """
-    Safely send a message to the frontend via WebSocket.
-    Returns True if sent, False if server unavailable.
+    Safely queue a message to the frontend via WebSocket.
+    Messages are flushed in batches after FRONTEND_BATCH_DELAY_SEC.
+    Returns True if queued, False if server unavailable.
     """
+    global _frontend_flush_scheduled
     if not SERVER_AVAILABLE or not hasattr(PromptServer, 'instance') or PromptServer.instance is None:
         print(f"Alexandria: Cannot send {event_type} - server not available")
         return False
 
     try:
-        PromptServer.instance.send_sync(event_type, data)
+        with _frontend_msgs_lock:
+            _pending_frontend_msgs.append({"type": event_type, "data": data})
+            schedule = not _frontend_flush_scheduled
+            _frontend_flush_scheduled = True
+
+        if schedule:
+            # Nodes execute on the prompt worker thread, so hop onto the server loop
+            loop = PromptServer.instance.loop
+            loop.call_soon_threadsafe(loop.call_later, FRONTEND_BATCH_DELAY_SEC, _flush_frontend)
         return True
     except Exception as e:
+        with _frontend_msgs_lock:
+            _frontend_flush_scheduled = False
         print(f"Alexandria: Failed to send {event_type}: {e}")
         return False
 
@@ -123,8 +216,8 @@ class AlexandriaSaveNode:
         Trigger a save and return template info.
         Templates are always saved to server file storage for cross-PC access.
         """
-        global _current_storage_dir
-        timestamp = datetime.now().isoformat()
+        global _current_storage_dir, _storage_path_cache
+        timestamp = _iso_now()
 
         # Use override name if enabled, otherwise use the input template_name
         actual_name = override_name if name_override else template_name
@@ -132,11 +225,11 @@ class AlexandriaSaveNode:
         # Use custom path if override enabled, otherwise use default
         storage_dir = custom_path if path_override and custom_path else DEFAULT_STORAGE_DIR
         _current_storage_dir = storage_dir
+        if path_override:
+            _storage_path_cache = (None, Path())
 
         # Ensure the storage directory exists
-        storage_path = Path(storage_dir)
-        if not storage_path.is_absolute():
-            storage_path = Path(os.getcwd()) / storage_path
+        storage_path = _get_storage_path()
 
         try:
             storage_path.mkdir(parents=True, exist_ok=True)
@@ -147,7 +240,7 @@ class AlexandriaSaveNode:
             "node_id": unique_id,
             "template_name": actual_name,
             "timestamp": timestamp,
-            "storage_directory": str(_get_storage_path()),
+            "storage_directory": str(storage_path),
         })
         return (actual_name, timestamp)
 
@@ -158,6 +251,8 @@ class AlexandriaControlNode:
     Outputs template_name so it can be connected to Save/Load nodes.
 
     The frontend adds Save Now, Load Template, and Open Panel buttons.
+    The buttons act from the frontend, and the output depends only on template_name,
+    so there is no IS_CHANGED - ComfyUI caches this node by its inputs.
     """
 
     CATEGORY = "Alexandria"
@@ -179,11 +274,6 @@ class AlexandriaControlNode:
             }
         }
 
-    @classmethod
-    def IS_CHANGED(cls, **kwargs):
-        # Always consider changed so buttons work on re-execution
-        return float("nan")
-
     def execute(self, template_name, unique_id=None):
         # Output template_name so it can be connected to other Alexandria nodes
         return (template_name,)
@@ -193,68 +283,196 @@ class AlexandriaControlNode:
 
 def _get_storage_path():
     """Get the current storage directory as an absolute Path."""
-    global _current_storage_dir
+    global _storage_path_cache
     storage_dir = _current_storage_dir or DEFAULT_STORAGE_DIR
+    if _storage_path_cache[0] == storage_dir:
+        return _storage_path_cache[1]
+
     storage_path = Path(storage_dir)
     if not storage_path.is_absolute():
         storage_path = Path(os.getcwd()) / storage_path
+    _storage_path_cache = (storage_dir, storage_path)
     return storage_path
 
 
+# Maps invalid filename characters to underscores
+_FILENAME_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+@functools.lru_cache(maxsize=256)
 def _sanitize_filename(name):
     """Sanitize a template name for use as a filename."""
-    # Remove/replace invalid filename characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    return name.strip()
+    # Most names are already clean - skip building a translated copy
+    if _INVALID_FILENAME_RE.search(name) is not None:
+        name = name.translate(_FILENAME_TRANS)
+    return name.strip() or "Unnamed"
 
 
-def _save_template_to_file(template_data):
-    """Save a template to a JSON file in the storage directory."""
-    storage_path = _get_storage_path()
-    storage_path.mkdir(parents=True, exist_ok=True)
+# Attempts at swapping a written temp file into place (see _save_template_to_file_sync)
+_REPLACE_RETRIES = 5
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _template_file_path(template_data):
+    """Get the JSON file path a template is stored at."""
+    safe_name = _sanitize_filename(template_data.get('name', 'Unnamed'))
+    return _get_storage_path() / f"{safe_name}.json"
 
-    template_name = template_data.get('name', 'Unnamed')
-    safe_name = _sanitize_filename(template_name)
-    file_path = storage_path / f"{safe_name}.json"
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(template_data, f, indent=2, ensure_ascii=False)
+def _save_template_to_file_sync(template_data, file_path):
+    """Save a template to a JSON file in the storage directory."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Write to a unique temp file and swap it in so an interrupted write never
+    # leaves a truncated template behind
+    # Underscore prefix marks leftovers from a crash as internal files
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix='_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_json_dumps(template_data, indent=True))
+        # mkstemp creates owner-only files; keep the existing file's mode, or use
+        # the mode open() would have created it with
+        try:
+            mode = os.stat(file_path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        for attempt in range(_REPLACE_RETRIES):
+            try:
+                os.replace(tmp_path, file_path)
+                break
+            except PermissionError:
+                # Windows refuses to replace a file another thread has open for reading
+                if attempt == _REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(0.05)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    # Don't trust the mtime cache for a file we just replaced - coarse mtimes can collide
+    _template_cache.pop(str(file_path), None)
     return str(file_path)
 
 
-def _load_templates_from_directory():
-    """Load all templates from the storage directory."""
+# Per-file locks so overlapping saves of the same template are written one at a time.
+# Weak values: a lock disappears once no save holds or waits on it.
+_write_locks = weakref.WeakValueDictionary()
+
+
+async def _save_template_to_file(template_data):
+    """Save a template to file storage without blocking the event loop."""
+    file_path = _template_file_path(template_data)
+    key = str(file_path)
+    lock = _write_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _write_locks[key] = lock
+    async with lock:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _save_template_to_file_sync, template_data, file_path)
+
+
+# Parsed templates keyed by file path string, with the (mtime_ns, size, inode) they were
+# read at. Unchanged files are served from here instead of being re-parsed on every load.
+_template_cache = {}
+
+
+def _normalize_template(template, file_path):
+    """
+    Fill in the fields a loaded template is returned with.
+    Returns None if the template has no valid versions and should be skipped.
+    """
+    # Ensure template has required fields
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    if 'name' not in template:
+        template['name'] = stem
+    if 'id' not in template:
+        template['id'] = hashlib.md5(stem.encode()).hexdigest()[:16]
+    # Validate versions structure - skip templates without valid versions
+    if not isinstance(template.get('versions'), list) or len(template.get('versions', [])) == 0:
+        return None
+    template['_file_path'] = file_path
+    return template
+
+
+def _read_template_file(entry):
+    """Read and validate a template file from an os.DirEntry. Returns None if it should be skipped."""
+    file_path = entry.path
+    try:
+        st = entry.stat()
+        cached = _template_cache.get(file_path)
+        # Atomic replaces create a new inode, so include it alongside mtime and size
+        stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+
+        with open(file_path, 'rb') as f:
+            template = _normalize_template(_json_loads(f.read()), file_path)
+        if template is None:
+            print(f"Alexandria: Skipping template with invalid versions: {file_path}")
+
+        _template_cache[file_path] = (stat_key, template)
+        return template
+    except Exception as e:
+        print(f"Alexandria: Error loading template {file_path}: {e}")
+        return None
+
+
+async def _load_templates_from_directory_async():
+    """Load all templates from the storage directory without blocking the event loop."""
     storage_path = _get_storage_path()
 
-    if not storage_path.exists():
+    try:
+        with os.scandir(storage_path) as it:
+            # Skip settings and internal files (start with underscore)
+            entries = [
+                e for e in it
+                if e.name.endswith('.json') and not e.name.startswith('_') and e.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         return []
 
-    templates = []
-    for file_path in storage_path.glob("*.json"):
-        # Skip settings and internal files (start with underscore)
-        if file_path.name.startswith('_'):
-            continue
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                template = json.load(f)
-                # Ensure template has required fields
-                if 'name' not in template:
-                    template['name'] = file_path.stem
-                if 'id' not in template:
-                    template['id'] = hashlib.md5(file_path.stem.encode()).hexdigest()[:16]
-                # Validate versions structure - skip templates without valid versions
-                if not isinstance(template.get('versions'), list) or len(template.get('versions', [])) == 0:
-                    print(f"Alexandria: Skipping template with invalid versions: {file_path}")
-                    continue
-                template['_file_path'] = str(file_path)
-                templates.append(template)
-        except Exception as e:
-            print(f"Alexandria: Error loading template {file_path}: {e}")
+    # Drop cache entries for files that no longer exist
+    for stale_path in _template_cache.keys() - {e.path for e in entries}:
+        del _template_cache[stale_path]
 
-    return templates
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*[
+        loop.run_in_executor(None, _read_template_file, e) for e in entries
+    ])
+    return [t for t in results if t is not None]
+
+
+async def _flush_pending_save(template_name):
+    """Write the latest coalesced payload for a debounced template save."""
+    template_data = _pending_saves.pop(template_name, None)
+    if template_data is None:
+        return
+    try:
+        _last_save_ts[template_name] = time.monotonic()
+        # Goes through the same per-file write lock as direct saves
+        await _save_template_to_file(template_data)
+    except Exception as e:
+        print(f"Alexandria: Error writing debounced save for {template_name}: {e}")
+        # The client was already told "queued" - forget this hash so a retry writes again
+        if _template_state.get(template_name) == template_data["hash"]:
+            del _template_state[template_name]
+
+
+def _schedule_pending_flush(template_name, delay):
+    """Schedule the trailing write for a debounced template save."""
+    def start_flush():
+        # Hold a reference so the task isn't garbage collected before it finishes
+        task = asyncio.ensure_future(_flush_pending_save(template_name))
+        _flush_tasks.add(task)
+        task.add_done_callback(_flush_tasks.discard)
+
+    asyncio.get_running_loop().call_later(delay, start_flush)
 
 
 def _delete_template_file(template_name):
@@ -265,13 +483,17 @@ def _delete_template_file(template_name):
 
     if file_path.exists():
         file_path.unlink()
+        _template_cache.pop(str(file_path), None)
         return True
     return False
 
 
 # ============ API Routes ============
 
-if SERVER_AVAILABLE:
+# Guard against registering the routes twice if this module is re-imported (hot reload)
+_ROUTES_REGISTERED = SERVER_AVAILABLE and getattr(PromptServer.instance, "_alexandria_routes_registered", False)
+
+if SERVER_AVAILABLE and not _ROUTES_REGISTERED:
     routes = PromptServer.instance.routes
 
     @routes.get("/alexandria/storage-dir")
@@ -287,11 +509,12 @@ if SERVER_AVAILABLE:
     @routes.post("/alexandria/storage-dir")
     async def set_storage_dir(request):
         """Set the storage directory."""
-        global _current_storage_dir
+        global _current_storage_dir, _storage_path_cache
         try:
             data = await request.json()
             new_dir = data.get("storage_directory", DEFAULT_STORAGE_DIR)
             _current_storage_dir = new_dir
+            _storage_path_cache = (None, Path())
 
             storage_path = _get_storage_path()
             storage_path.mkdir(parents=True, exist_ok=True)
@@ -310,7 +533,7 @@ if SERVER_AVAILABLE:
     async def get_templates(request):
         """Get all templates from the storage directory."""
         try:
-            templates = _load_templates_from_directory()
+            templates = await _load_templates_from_directory_async()
             return web.json_response({
                 "status": "ok",
                 "templates": templates,
@@ -327,7 +550,7 @@ if SERVER_AVAILABLE:
     async def save_template_to_file(request):
         """Save a template to a file."""
         try:
-            template_data = await request.json()
+            template_data = _json_loads(await request.read())
 
             if not template_data.get('name'):
                 return web.json_response({
@@ -337,11 +560,11 @@ if SERVER_AVAILABLE:
 
             # Add timestamp if not present
             if 'updatedAt' not in template_data:
-                template_data['updatedAt'] = datetime.now().isoformat()
+                template_data['updatedAt'] = _iso_now()
             if 'createdAt' not in template_data:
                 template_data['createdAt'] = template_data['updatedAt']
 
-            file_path = _save_template_to_file(template_data)
+            file_path = await _save_template_to_file(template_data)
 
             return web.json_response({
                 "status": "ok",
@@ -392,28 +615,43 @@ if SERVER_AVAILABLE:
         Accepts templates from browser and merges with file storage.
         """
         try:
-            data = await request.json()
+            data = _json_loads(await request.read())
             browser_templates = data.get("templates", [])
 
             # Load existing file templates
-            file_templates = _load_templates_from_directory()
+            file_templates = await _load_templates_from_directory_async()
             file_template_names = {t['name'] for t in file_templates}
 
-            # Save any browser templates not in files
+            # Save any browser templates not in files, merging them in memory
+            # instead of re-reading the directory afterwards. Merge by file path:
+            # different names can sanitize to the same file, which the write replaced.
+            merged = {t['_file_path']: t for t in file_templates}
             saved_count = 0
             for template in browser_templates:
                 if template.get('name') and template['name'] not in file_template_names:
-                    _save_template_to_file(template)
+                    file_path = await _save_template_to_file(template)
                     saved_count += 1
-
-            # Return all templates (merged)
-            all_templates = _load_templates_from_directory()
+                    # On case-insensitive filesystems the write may have replaced a file
+                    # listed under a differently-cased path - drop that stale entry
+                    for other_path in [p for p in merged if p != file_path and p.lower() == file_path.lower()]:
+                        try:
+                            if os.path.samefile(other_path, file_path):
+                                del merged[other_path]
+                                _template_cache.pop(other_path, None)
+                        except OSError:
+                            pass
+                    normalized = _normalize_template(dict(template), file_path)
+                    if normalized is not None:
+                        merged[file_path] = normalized
+                    else:
+                        merged.pop(file_path, None)
+            file_templates = list(merged.values())
 
             return web.json_response({
                 "status": "ok",
-                "templates": all_templates,
+                "templates": file_templates,
                 "saved_count": saved_count,
-                "total_count": len(all_templates)
+                "total_count": len(file_templates)
             })
 
         except Exception as e:
@@ -428,9 +666,17 @@ if SERVER_AVAILABLE:
         API endpoint for saving templates from nodes.
         Used for server-side diff detection to avoid duplicate saves.
         Also saves to file storage.
+
+        Response status is one of:
+        - "ok": template written; includes file_path
+        - "skipped": content unchanged since the last save, nothing written
+        - "queued": a save for this template landed within the debounce window;
+          the write is deferred until the window closes, so there is no file_path yet
+        - "error": message describes the failure
         """
         try:
-            data = await request.json()
+            raw = await request.read()
+            data = _json_loads(raw)
             template_name = data.get("template_name", "Unnamed")
             entries = data.get("entries", [])
 
@@ -441,11 +687,25 @@ if SERVER_AVAILABLE:
                 })
 
             # Compute hash for diff detection
-            content = json.dumps(entries, sort_keys=True)
-            new_hash = hashlib.md5(content.encode()).hexdigest()
+            # Canonical clients send a stable body, so hash it as-is instead of re-serializing
+            canonical = (
+                request.content_type == CANONICAL_CONTENT_TYPE
+                or request.headers.get("X-Alexandria-Canonical") == "1"
+            )
+            if canonical:
+                new_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            else:
+                # Feed entries one at a time to avoid serializing the whole payload at once;
+                # the newline delimiter keeps e.g. [1, 23] and [12, 3] from colliding
+                hasher = hashlib.blake2b(digest_size=16)
+                for entry in entries:
+                    hasher.update(_json_dumps(entry, sort_keys=True))
+                    hasher.update(b'\n')
+                new_hash = hasher.hexdigest()
 
             # Check if content changed
             if template_name in _template_state:
+                _template_state.move_to_end(template_name)
                 if _template_state[template_name] == new_hash:
                     return web.json_response({
                         "status": "skipped",
@@ -460,9 +720,24 @@ if SERVER_AVAILABLE:
                 "name": template_name,
                 "entries": entries,
                 "hash": new_hash,
-                "updatedAt": datetime.now().isoformat(),
+                "updatedAt": _iso_now(),
             }
-            file_path = _save_template_to_file(template_data)
+
+            # Coalesce bursts: defer the write until the debounce window closes
+            elapsed = time.monotonic() - _last_save_ts.get(template_name, 0)
+            if elapsed < _SAVE_DEBOUNCE_SEC or template_name in _pending_saves:
+                if template_name not in _pending_saves:
+                    _schedule_pending_flush(template_name, _SAVE_DEBOUNCE_SEC - elapsed)
+                _pending_saves[template_name] = template_data
+                return web.json_response({
+                    "status": "queued",
+                    "template_name": template_name,
+                    "hash": new_hash,
+                    "entry_count": len(entries),
+                })
+
+            _last_save_ts[template_name] = time.monotonic()
+            file_path = await _save_template_to_file(template_data)
 
             return web.json_response({
                 "status": "ok",
@@ -660,6 +935,8 @@ if SERVER_AVAILABLE:
                 "message": str(e)
             })
 
+    PromptServer.instance._alexandria_routes_registered = True
+
 
 # ============ Node Registration ============
 
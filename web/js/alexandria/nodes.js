@@ -24,6 +24,37 @@ let saveInProgress = false;
 
 // ============ WebSocket Handlers ============
 
+/**
+ * Handle a save trigger message from the backend
+ * @param {Object} detail - Message payload
+ * @returns {Promise<boolean>} Resolves when the save finishes
+ */
+function onTriggerSave(detail) {
+  const { node_id, template_name, storage_directory } = detail;
+  console.log(`Alexandria: Save triggered by node ${node_id} for "${template_name}"`);
+  return handleNodeSave(template_name, storage_directory);
+}
+
+/**
+ * Handle a storage directory update message from the backend
+ * @param {Object} detail - Message payload
+ * @returns {Promise<void>} Resolves when templates are synced
+ */
+function onStorageDir(detail) {
+  const { node_id, storage_directory } = detail;
+  console.log(`Alexandria: Storage directory set to "${storage_directory}" by node ${node_id}`);
+  // Sync templates with the new storage directory
+  return Storage.syncTemplates().then(() => {
+    console.log('Alexandria: Templates synced with file storage');
+  });
+}
+
+// Handlers for messages delivered inside an "alexandria.batch" frame
+const batchHandlers = {
+  "alexandria.trigger_save": onTriggerSave,
+  "alexandria.storage_dir": onStorageDir,
+};
+
 /**
  * Setup WebSocket event handlers for node communication
  * Safe to call multiple times - only registers once
@@ -36,19 +67,30 @@ export function setupWebSocketHandlers() {
 
   // Listen for save trigger from backend
   api.addEventListener("alexandria.trigger_save", (event) => {
-    const { node_id, template_name, storage_directory } = event.detail;
-    console.log(`Alexandria: Save triggered by node ${node_id} for "${template_name}"`);
-    handleNodeSave(template_name, storage_directory);
+    onTriggerSave(event.detail);
   });
 
   // Listen for storage directory updates from Control node
   api.addEventListener("alexandria.storage_dir", (event) => {
-    const { node_id, storage_directory } = event.detail;
-    console.log(`Alexandria: Storage directory set to "${storage_directory}" by node ${node_id}`);
-    // Sync templates with the new storage directory
-    Storage.syncTemplates().then(() => {
-      console.log('Alexandria: Templates synced with file storage');
-    });
+    onStorageDir(event.detail);
+  });
+
+  // Backend coalesces messages into batches - fan them out to the handlers above.
+  // Await each one in order: handleNodeSave skips saves while another is in progress,
+  // so firing them all at once would drop every save after the first.
+  api.addEventListener("alexandria.batch", async (event) => {
+    for (const msg of event.detail?.msgs || []) {
+      const handler = batchHandlers[msg.type];
+      if (handler) {
+        try {
+          await handler(msg.data);
+        } catch (e) {
+          console.error(`Alexandria: Error handling batched message "${msg.type}":`, e);
+        }
+      } else if (Storage.isDebugEnabled()) {
+        console.log(`Alexandria: Ignoring unknown batched message "${msg.type}"`);
+      }
+    }
   });
 
   handlersSetup = true;